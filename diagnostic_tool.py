@@ -13,13 +13,25 @@ import os
 import sys
 import json
 import platform
+import shutil
 import subprocess
 import sqlite3
+import stat
 import datetime
+import time
 import argparse
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson  # Optional: much faster JSON encoding for the report
+except ImportError:
+    orjson = None
+
 # ANSI color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -32,14 +44,72 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Piped output (log files, CI) gets plain text instead of escape codes
+if not (sys.stdout and sys.stdout.isatty()):
+    for _name in ('HEADER', 'OKBLUE', 'OKCYAN', 'OKGREEN', 'WARNING',
+                  'FAIL', 'ENDC', 'BOLD', 'UNDERLINE'):
+        setattr(Colors, _name, '')
+
+# Status -> (color, line prefix) used when printing results
+_STATUS_META = {
+    "OK": (Colors.OKGREEN, "  ✓ "),
+    "WARNING": (Colors.WARNING, "  ⚠ "),
+    "FAIL": (Colors.FAIL, "  ✗ "),
+    "INFO": (Colors.OKBLUE, "  ℹ "),
+}
+_DEFAULT_STATUS_META = ("", "  • ")
+
+# Tables the application creates in aifilesorter.db
+EXPECTED_TABLES = (
+    "categorization_cache",
+    "taxonomy",
+    "confidence_scores",
+    "content_analysis_cache",
+    "api_usage_tracking",
+    "user_profiles",
+    "user_corrections",
+    "categorization_sessions",
+    "undo_history",
+    "file_tinder_state",
+)
+_EXPECTED_TABLE_SET = frozenset(EXPECTED_TABLES)
+
 class DiagnosticResult:
     """Stores the result of a diagnostic check"""
+    __slots__ = ("name", "status", "message", "details", "timestamp")
+    
     def __init__(self, name: str, status: str, message: str, details: Optional[str] = None):
         self.name = name
         self.status = status  # OK, WARNING, FAIL, INFO
         self.message = message
         self.details = details
-        self.timestamp = datetime.datetime.now().isoformat()
+        self.timestamp = time.time()  # Formatted as ISO 8601 in the report
+    
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """Return the result as a JSON-serializable dict"""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "message": self.message,
+            "details": self.details,
+            "timestamp": datetime.datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+def _count_files(path) -> int:
+    """Count files under path with os.scandir, reusing d_type where possible"""
+    count = 0
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+        except OSError:
+            continue
+    return count
 
 class DiagnosticTool:
     """Main diagnostic tool class"""
@@ -48,10 +118,17 @@ class DiagnosticTool:
         self.verbose = verbose
         self.results: List[DiagnosticResult] = []
         self.platform = platform.system()
-        self.start_time = datetime.datetime.now()
+        self.is_windows = self.platform == "Windows"
+        self.start_ts = time.time()
+        self.start_time = datetime.datetime.fromtimestamp(self.start_ts)
+        # Per-thread output/result buffers used while checks run concurrently
+        self._local = threading.local()
+        # Directory listings shared by the database/config/log probes
+        self._dir_listings: Dict[Path, Dict[str, os.DirEntry]] = {}
+        self._dir_listings_lock = threading.Lock()
         
         # Determine base directory
-        if self.platform == "Windows":
+        if self.is_windows:
             self.app_dir = Path("app/build-windows/Release")
             if not self.app_dir.exists():
                 self.app_dir = Path(".")
@@ -59,39 +136,74 @@ class DiagnosticTool:
             self.app_dir = Path("app/bin")
             if not self.app_dir.exists():
                 self.app_dir = Path(".")
+        
+        # Platform-specific paths, resolved once for all checks
+        if self.is_windows:
+            user_dir = Path(os.path.expandvars("%APPDATA%/aifilesorter"))
+            self.executables = ("StartAiFileSorter.exe", "aifilesorter.exe")
+            self.qt_libs = ("Qt6Core.dll", "Qt6Gui.dll", "Qt6Widgets.dll")
+            self.db_paths = (user_dir / "aifilesorter.db", Path("aifilesorter.db"))
+            self.config_paths = (user_dir / "config.ini",)
+            self.log_dirs = (user_dir / "logs", Path("logs"))
+            self.lib_suffix = ".dll"
+        else:
+            self.executables = ("app/bin/aifilesorter", "app/bin/run_aifilesorter.sh")
+            self.qt_libs = ()
+            self.db_paths = (
+                Path.home() / ".local/share/aifilesorter/aifilesorter.db",
+                Path("aifilesorter.db"),
+            )
+            self.config_paths = (Path.home() / ".config/aifilesorter/config.ini",)
+            self.log_dirs = (Path.home() / ".local/share/aifilesorter/logs", Path("logs"))
+            self.lib_suffix = ".so"
     
     def log(self, message: str, color: str = ""):
         """Print a log message"""
-        if color:
-            print(f"{color}{message}{Colors.ENDC}")
+        line = color + message + Colors.ENDC if color else message
+        lines = getattr(self._local, "lines", None)
+        if lines is not None:
+            lines.append(line)
         else:
-            print(message)
+            print(line)
+    
+    @contextmanager
+    def _buffered_output(self):
+        """Collect log lines in the block and emit them with a single write"""
+        self._local.lines = []
+        try:
+            yield
+        finally:
+            lines = self._local.lines
+            del self._local.lines
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
     
     def add_result(self, name: str, status: str, message: str, details: Optional[str] = None):
         """Add a diagnostic result"""
-        result = DiagnosticResult(name, status, message, details)
-        self.results.append(result)
+        result = DiagnosticResult(name, sys.intern(status), message, details)
+        getattr(self._local, "results", self.results).append(result)
         
         # Print result
-        status_color = {
-            "OK": Colors.OKGREEN,
-            "WARNING": Colors.WARNING,
-            "FAIL": Colors.FAIL,
-            "INFO": Colors.OKBLUE
-        }.get(status, "")
-        
-        status_symbol = {
-            "OK": "✓",
-            "WARNING": "⚠",
-            "FAIL": "✗",
-            "INFO": "ℹ"
-        }.get(status, "•")
-        
-        self.log(f"  {status_symbol} {name}: {message}", status_color)
+        status_color, prefix = _STATUS_META.get(status, _DEFAULT_STATUS_META)
+        self.log(prefix + name + ": " + message, status_color)
         
         if self.verbose and details:
             self.log(f"    Details: {details}", Colors.OKCYAN)
     
+    def _dir_entry(self, path: Path) -> Optional[os.DirEntry]:
+        """Look up path in a once-per-run os.scandir listing of its parent"""
+        parent = path.parent
+        with self._dir_listings_lock:
+            listing = self._dir_listings.get(parent)
+            if listing is None:
+                try:
+                    with os.scandir(parent) as it:
+                        listing = {os.path.normcase(e.name): e for e in it}
+                except OSError:
+                    listing = {}
+                self._dir_listings[parent] = listing
+        return listing.get(os.path.normcase(path.name))
+    
     def section_header(self, title: str):
         """Print a section header"""
         self.log(f"\n{'='*80}", Colors.HEADER)
@@ -135,21 +247,16 @@ class DiagnosticTool:
         self.section_header("File System Structure")
         
         # Required executables
-        if self.platform == "Windows":
-            executables = [
-                "StartAiFileSorter.exe",
-                "aifilesorter.exe"
-            ]
-        else:
-            executables = [
-                "app/bin/aifilesorter",
-                "app/bin/run_aifilesorter.sh"
-            ]
-        
-        for exe in executables:
+        for exe in self.executables:
             try:
                 exe_path = Path(exe)
-                if exe_path.exists():
+                try:
+                    os.stat(exe_path)
+                    found = True
+                except (FileNotFoundError, NotADirectoryError):
+                    found = False
+                
+                if found:
                     self.add_result(
                         f"Executable: {exe}",
                         "OK",
@@ -181,12 +288,22 @@ class DiagnosticTool:
         for dir_path in required_dirs:
             try:
                 dir_path = Path(dir_path)
-                if dir_path.exists() and dir_path.is_dir():
-                    file_count = sum(1 for _ in dir_path.rglob('*') if _.is_file())
+                try:
+                    is_dir = stat.S_ISDIR(os.stat(dir_path).st_mode)
+                except (FileNotFoundError, NotADirectoryError):
+                    is_dir = False
+                
+                if is_dir:
+                    # The recursive file count is only worth a full tree walk
+                    # when the user asked for detailed output
+                    if self.verbose:
+                        found_message = f"Found ({_count_files(dir_path)} files)"
+                    else:
+                        found_message = "Found"
                     self.add_result(
                         f"Directory: {dir_path}",
                         "OK",
-                        f"Found ({file_count} files)",
+                        found_message,
                         f"Path: {dir_path.absolute()}"
                     )
                 else:
@@ -211,8 +328,7 @@ class DiagnosticTool:
         self.section_header("Dependencies")
         
         # Qt libraries (platform-specific)
-        if self.platform == "Windows":
-            qt_libs = ["Qt6Core.dll", "Qt6Gui.dll", "Qt6Widgets.dll"]
+        if self.is_windows:
             lib_dir = self.app_dir
         else:
             # On Linux/macOS, Qt is typically system-wide
@@ -269,11 +385,15 @@ class DiagnosticTool:
             return
         
         # Check Windows Qt DLLs
-        for lib in qt_libs:
+        for lib in self.qt_libs:
             try:
                 lib_path = lib_dir / lib
-                if lib_path.exists():
-                    size = lib_path.stat().st_size
+                try:
+                    size = os.stat(lib_path).st_size
+                except (FileNotFoundError, NotADirectoryError):
+                    size = None
+                
+                if size is not None:
                     size_kb = max(1, size // 1024)  # At least 1 KB for display
                     self.add_result(
                         f"Library: {lib}",
@@ -305,14 +425,27 @@ class DiagnosticTool:
         # Check for GGML directories
         ggml_variants = ["wocuda", "wcuda", "wvulkan"]
         
+        # No variant can exist without the parent directory; report it once
+        # instead of probing each variant
+        ggml_root = Path("app/lib/ggml")
+        if not os.access(ggml_root, os.F_OK):
+            self.add_result(
+                "Backend: ggml",
+                "WARNING",
+                "Not found (no backend variants available)",
+                f"Expected at: {ggml_root.absolute()}"
+            )
+            ggml_variants = []
+        
         for variant in ggml_variants:
-            if self.platform == "Windows":
-                ggml_path = Path(f"app/lib/ggml/{variant}")
-            else:
-                ggml_path = Path(f"app/lib/ggml/{variant}")
+            ggml_path = Path(f"app/lib/ggml/{variant}")
             
             if ggml_path.exists():
-                dll_count = sum(1 for f in ggml_path.glob("*.dll" if self.platform == "Windows" else "*.so"))
+                # Suffixes match like glob: case-insensitively only on Windows
+                dll_count = sum(
+                    1 for name in os.listdir(ggml_path)
+                    if os.path.normcase(name).endswith(self.lib_suffix)
+                )
                 backend_type = {
                     "wocuda": "CPU (OpenBLAS)",
                     "wcuda": "CUDA (NVIDIA GPU)",
@@ -359,23 +492,16 @@ class DiagnosticTool:
         self.section_header("Database")
         
         # Find database file
-        if self.platform == "Windows":
-            db_paths = [
-                Path(os.path.expandvars("%APPDATA%/aifilesorter/aifilesorter.db")),
-                Path("aifilesorter.db"),
-            ]
-        else:
-            db_paths = [
-                Path.home() / ".local/share/aifilesorter/aifilesorter.db",
-                Path("aifilesorter.db"),
-            ]
-        
         db_path = None
-        for path in db_paths:
+        db_size = 0
+        for path in self.db_paths:
             try:
-                if path.exists():
-                    db_path = path
-                    break
+                entry = self._dir_entry(path)
+                if entry is None:
+                    continue
+                db_size = entry.stat().st_size
+                db_path = path
+                break
             except Exception as e:
                 self.add_result(
                     f"Database Path Check: {path}",
@@ -389,65 +515,54 @@ class DiagnosticTool:
                 "Database File",
                 "INFO",
                 "Not found (will be created on first run)",
-                f"Expected locations: {', '.join(str(p) for p in db_paths)}"
+                f"Expected locations: {', '.join(str(p) for p in self.db_paths)}"
             )
             return
         
-        try:
-            file_size = db_path.stat().st_size
-            self.add_result(
-                "Database File",
-                "OK",
-                f"Found ({file_size // 1024} KB)",
-                f"Path: {db_path}"
-            )
-        except Exception as e:
-            self.add_result(
-                "Database File",
-                "FAIL",
-                f"Error reading database file: {str(e)}",
-                f"Path: {db_path}"
-            )
-            return
+        self.add_result(
+            "Database File",
+            "OK",
+            f"Found ({db_size // 1024} KB)",
+            f"Path: {db_path}"
+        )
         
         # Check database integrity
         try:
-            conn = sqlite3.connect(db_path)
+            # Read-only open: the diagnostic never writes, but still takes
+            # SQLite's normal locks and honours hot journals/WAL, so results
+            # stay consistent while the application is using the database
+            conn = sqlite3.connect(
+                f"{db_path.absolute().as_uri()}?mode=ro",
+                uri=True,
+                isolation_level=None
+            )
+            conn.execute("PRAGMA query_only=1")
             cursor = conn.cursor()
             
             # Check tables
+            tables = None
             try:
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                expected_tables = [
-                    "categorization_cache",
-                    "taxonomy",
-                    "confidence_scores",
-                    "content_analysis_cache",
-                    "api_usage_tracking",
-                    "user_profiles",
-                    "user_corrections",
-                    "categorization_sessions",
-                    "undo_history",
-                    "file_tinder_state"
-                ]
+                tables = {row[0] for row in cursor.fetchall()}
                 
-                found_tables = [t for t in expected_tables if t in tables]
-                missing_tables = [t for t in expected_tables if t not in tables]
+                # Hash lookups against the fetched names; iterate the expected
+                # list so the report keeps its declaration order
+                missing = _EXPECTED_TABLE_SET - tables
+                found_tables = [t for t in EXPECTED_TABLES if t not in missing]
+                missing_tables = [t for t in EXPECTED_TABLES if t in missing]
                 
-                if len(found_tables) == len(expected_tables):
+                if len(found_tables) == len(EXPECTED_TABLES):
                     self.add_result(
                         "Database Tables",
                         "OK",
-                        f"All {len(expected_tables)} tables found",
+                        f"All {len(EXPECTED_TABLES)} tables found",
                         f"Tables: {', '.join(found_tables)}"
                     )
                 else:
                     self.add_result(
                         "Database Tables",
                         "WARNING",
-                        f"Found {len(found_tables)}/{len(expected_tables)} tables",
+                        f"Found {len(found_tables)}/{len(EXPECTED_TABLES)} tables",
                         f"Missing: {', '.join(missing_tables)}"
                     )
             except sqlite3.Error as e:
@@ -458,43 +573,43 @@ class DiagnosticTool:
                     None
                 )
             
-            # Check cache statistics
+            # Cache statistics and API usage tracking, counted in one query.
+            # Only tables known to exist are queried so a missing one does
+            # not fail the other count.
+            count_checks = [
+                ("categorization_cache", "Cache Entries", "{} cached categorizations",
+                 "Could not query cache", "Cache table may not exist yet"),
+                ("api_usage_tracking", "API Usage Records", "{} API calls tracked",
+                 "Could not query API usage", "API usage table may not exist yet"),
+            ]
+            present = [c[0] for c in count_checks if tables is None or c[0] in tables]
+            counts = {}
+            count_error = None
             try:
-                cursor.execute("SELECT COUNT(*) FROM categorization_cache")
-                cache_count = cursor.fetchone()[0]
-                
-                self.add_result(
-                    "Cache Entries",
-                    "INFO",
-                    f"{cache_count} cached categorizations",
-                    None
-                )
+                if present:
+                    cursor.execute(
+                        "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t})" for t in present)
+                    )
+                    counts = dict(zip(present, cursor.fetchone()))
             except sqlite3.Error as e:
-                self.add_result(
-                    "Cache Entries",
-                    "WARNING",
-                    f"Could not query cache: {str(e)}",
-                    "Cache table may not exist yet"
-                )
+                count_error = e
             
-            # Check API usage tracking
-            try:
-                cursor.execute("SELECT COUNT(*) FROM api_usage_tracking")
-                api_usage_count = cursor.fetchone()[0]
-                
-                self.add_result(
-                    "API Usage Records",
-                    "INFO",
-                    f"{api_usage_count} API calls tracked",
-                    None
-                )
-            except sqlite3.Error as e:
-                self.add_result(
-                    "API Usage Records",
-                    "WARNING",
-                    f"Could not query API usage: {str(e)}",
-                    "API usage table may not exist yet"
-                )
+            for table, name, ok_message, warn_message, warn_details in count_checks:
+                if table in counts:
+                    self.add_result(
+                        name,
+                        "INFO",
+                        ok_message.format(counts[table]),
+                        None
+                    )
+                else:
+                    reason = str(count_error) if count_error else f"no such table: {table}"
+                    self.add_result(
+                        name,
+                        "WARNING",
+                        f"{warn_message}: {reason}",
+                        warn_details
+                    )
             
             conn.close()
             
@@ -520,18 +635,9 @@ class DiagnosticTool:
         self.section_header("Configuration")
         
         # Find config file
-        if self.platform == "Windows":
-            config_paths = [
-                Path(os.path.expandvars("%APPDATA%/aifilesorter/config.ini")),
-            ]
-        else:
-            config_paths = [
-                Path.home() / ".config/aifilesorter/config.ini",
-            ]
-        
         config_path = None
-        for path in config_paths:
-            if path.exists():
+        for path in self.config_paths:
+            if self._dir_entry(path) is not None:
                 config_path = path
                 break
         
@@ -540,7 +646,7 @@ class DiagnosticTool:
                 "Configuration File",
                 "INFO",
                 "Not found (will be created on first run)",
-                f"Expected locations: {', '.join(str(p) for p in config_paths)}"
+                f"Expected locations: {', '.join(str(p) for p in self.config_paths)}"
             )
             return
         
@@ -564,9 +670,11 @@ class DiagnosticTool:
                     None
                 )
                 
-                # Check for API keys (without revealing them)
-                has_openai = "openai" in config_content.lower()
-                has_gemini = "gemini" in config_content.lower()
+                # Check for API keys (without revealing them); lowercase once
+                # and scan the same copy for every provider
+                lowered = config_content.lower()
+                has_openai = "openai" in lowered
+                has_gemini = "gemini" in lowered
                 
                 if has_openai or has_gemini:
                     apis = []
@@ -604,20 +712,9 @@ class DiagnosticTool:
         self.section_header("Log Files")
         
         # Find log directory
-        if self.platform == "Windows":
-            log_dirs = [
-                Path(os.path.expandvars("%APPDATA%/aifilesorter/logs")),
-                Path("logs"),
-            ]
-        else:
-            log_dirs = [
-                Path.home() / ".local/share/aifilesorter/logs",
-                Path("logs"),
-            ]
-        
         log_dir = None
-        for path in log_dirs:
-            if path.exists():
+        for path in self.log_dirs:
+            if self._dir_entry(path) is not None:
                 log_dir = path
                 break
         
@@ -626,12 +723,26 @@ class DiagnosticTool:
                 "Log Directory",
                 "INFO",
                 "Not found (will be created on first run)",
-                f"Expected locations: {', '.join(str(p) for p in log_dirs)}"
+                f"Expected locations: {', '.join(str(p) for p in self.log_dirs)}"
             )
             return
         
-        # Count log files
-        log_files = list(log_dir.glob("*.log")) + list(log_dir.glob("*.txt"))
+        # Count log files (*.log first, then *.txt) and collect error logs
+        # in a single directory pass; only error logs need their mtime
+        # (suffixes match like glob: case-insensitively only on Windows)
+        log_entries, txt_entries = [], []
+        try:
+            with os.scandir(log_dir) as it:
+                for entry in it:
+                    name = os.path.normcase(entry.name)
+                    if name.endswith(".log"):
+                        log_entries.append(entry)
+                    elif name.endswith(".txt"):
+                        txt_entries.append(entry)
+        except OSError:
+            # Not a directory or unreadable: report it as holding no logs
+            log_entries, txt_entries = [], []
+        log_files = log_entries + txt_entries
         
         self.add_result(
             "Log Directory",
@@ -641,27 +752,37 @@ class DiagnosticTool:
         )
         
         # Check for error logs
-        error_logs = [f for f in log_files if "error" in f.name.lower()]
+        error_logs = [
+            (e.stat().st_mtime, e.path, e.name)
+            for e in log_files if "error" in e.name.lower()
+        ]
         if error_logs:
             self.add_result(
                 "Error Logs",
                 "WARNING",
                 f"{len(error_logs)} error log(s) found",
-                f"Files: {', '.join(f.name for f in error_logs)}"
+                f"Files: {', '.join(name for _, _, name in error_logs)}"
             )
             
             # Check the most recent error log
             if error_logs:
-                latest_error = max(error_logs, key=lambda f: f.stat().st_mtime)
+                _, latest_error, latest_name = max(error_logs)
                 try:
-                    with open(latest_error, 'r') as f:
-                        lines = f.readlines()
+                    # Only the tail is reported, so read the last 8 KiB instead
+                    # of the whole (possibly multi-MB) log
+                    with open(latest_error, 'rb') as f:
+                        size = os.fstat(f.fileno()).st_size
+                        offset = max(0, size - 8192)
+                        f.seek(offset)
+                        lines = f.read().decode('utf-8', errors='replace').splitlines()
+                        if offset and len(lines) > 1:
+                            lines = lines[1:]  # Drop the partial first line
                         if lines:
                             last_lines = lines[-5:]  # Last 5 lines
                             self.add_result(
                                 "Recent Errors",
                                 "INFO",
-                                f"Last {len(last_lines)} lines from {latest_error.name}",
+                                f"Last {len(last_lines)} lines from {latest_name}",
                                 '\n'.join(line.strip() for line in last_lines)
                             )
                 except Exception as e:
@@ -689,9 +810,18 @@ class DiagnosticTool:
             ("Local LLM", "app/lib/LocalLLMClient.cpp"),
         ]
         
+        # All sources live in app/lib; if it is missing, report that once
+        if not os.access("app/lib", os.F_OK):
+            self.add_result(
+                "Feature Sources",
+                "WARNING",
+                "Source directory not found",
+                f"Expected: {Path('app/lib')}"
+            )
+            return
+        
         for feature_name, file_path in features:
-            file_path = Path(file_path)
-            if file_path.exists():
+            if os.access(file_path, os.F_OK):
                 self.add_result(
                     f"Feature: {feature_name}",
                     "OK",
@@ -714,12 +844,14 @@ class DiagnosticTool:
         
         # Check available disk space
         try:
-            if self.platform == "Windows":
-                import shutil
+            if self.is_windows:
                 total, used, free = shutil.disk_usage("/")
             else:
-                import shutil
-                total, used, free = shutil.disk_usage(str(Path.home()))
+                # Same figures shutil.disk_usage derives, without the wrapper
+                st = os.statvfs(Path.home())
+                total = st.f_blocks * st.f_frsize
+                used = (st.f_blocks - st.f_bfree) * st.f_frsize
+                free = st.f_bavail * st.f_frsize
             
             free_gb = free / (1024**3)
             total_gb = total / (1024**3)
@@ -744,23 +876,21 @@ class DiagnosticTool:
         try:
             if self.platform == "Linux":
                 # Linux-specific memory check
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = f.read()
-                    for line in meminfo.splitlines():
-                        if line.startswith('MemTotal:'):
-                            total_mem = int(line.split()[1]) / 1024  # Convert to MB
-                            status = "OK" if total_mem > 4096 else "WARNING"
-                            self.add_result(
-                                "System Memory",
-                                status,
-                                f"{total_mem / 1024:.1f} GB total",
-                                None
-                            )
-                            break
+                # MemTotal is the first line, so a short bounded read is enough
+                with open('/proc/meminfo', 'rb') as f:
+                    head = f.read(128)
+                if head.startswith(b'MemTotal:'):
+                    total_mem = int(head.split(b':', 1)[1].split()[0]) / 1024  # Convert to MB
+                    status = "OK" if total_mem > 4096 else "WARNING"
+                    self.add_result(
+                        "System Memory",
+                        status,
+                        f"{total_mem / 1024:.1f} GB total",
+                        None
+                    )
             elif self.platform == "Darwin":
                 # macOS memory check
                 try:
-                    import subprocess
                     result = subprocess.run(['sysctl', 'hw.memsize'], capture_output=True, text=True)
                     if result.returncode == 0:
                         mem_bytes = int(result.stdout.split()[1])
@@ -798,93 +928,95 @@ class DiagnosticTool:
     
     # ==================== Report Generation ====================
     
-    def generate_report(self, output_file: Optional[str] = None) -> str:
-        """Generate a comprehensive diagnostic report"""
+    def generate_report(self, output_file: Optional[str] = None) -> bytes:
+        """Generate a comprehensive diagnostic report (returned as UTF-8 JSON bytes)"""
         
         # Calculate statistics
         total = len(self.results)
-        ok_count = sum(1 for r in self.results if r.status == "OK")
-        warning_count = sum(1 for r in self.results if r.status == "WARNING")
-        fail_count = sum(1 for r in self.results if r.status == "FAIL")
-        info_count = sum(1 for r in self.results if r.status == "INFO")
-        
-        # Print summary
-        self.section_header("Summary")
-        self.log(f"Total Checks: {total}")
-        self.log(f"  ✓ OK:       {ok_count}", Colors.OKGREEN)
-        self.log(f"  ⚠ Warning:  {warning_count}", Colors.WARNING)
-        self.log(f"  ✗ Failed:   {fail_count}", Colors.FAIL)
-        self.log(f"  ℹ Info:     {info_count}", Colors.OKBLUE)
-        
-        duration = (datetime.datetime.now() - self.start_time).total_seconds()
-        self.log(f"\nDuration: {duration:.2f} seconds")
-        
-        # Overall health status
-        if fail_count > 0:
-            health = "CRITICAL"
-            health_color = Colors.FAIL
-        elif warning_count > 3:
-            health = "NEEDS ATTENTION"
-            health_color = Colors.WARNING
-        elif warning_count > 0:
-            health = "GOOD"
-            health_color = Colors.WARNING
-        else:
-            health = "EXCELLENT"
-            health_color = Colors.OKGREEN
-        
-        self.log(f"\nOverall Health: {health}", health_color + Colors.BOLD)
-        
-        # Generate JSON report
-        report = {
-            "timestamp": self.start_time.isoformat(),
-            "duration_seconds": duration,
-            "platform": {
-                "system": platform.system(),
-                "release": platform.release(),
-                "machine": platform.machine(),
-            },
-            "summary": {
-                "total": total,
-                "ok": ok_count,
-                "warning": warning_count,
-                "fail": fail_count,
-                "info": info_count,
-                "health": health
-            },
-            "results": [
-                {
-                    "name": r.name,
-                    "status": r.status,
-                    "message": r.message,
-                    "details": r.details,
-                    "timestamp": r.timestamp
-                }
-                for r in self.results
-            ]
-        }
+        counts = {"OK": 0, "WARNING": 0, "FAIL": 0, "INFO": 0}
+        for r in self.results:
+            if r.status in counts:
+                counts[r.status] += 1
+        ok_count = counts["OK"]
+        warning_count = counts["WARNING"]
+        fail_count = counts["FAIL"]
+        info_count = counts["INFO"]
         
-        # Save to file if specified
-        if output_file:
-            try:
-                with open(output_file, 'w') as f:
-                    json.dump(report, f, indent=2)
-                self.log(f"\n{Colors.OKGREEN}Report saved to: {output_file}{Colors.ENDC}")
-            except Exception as e:
-                self.log(f"\n{Colors.FAIL}Failed to save report: {e}{Colors.ENDC}")
-        
-        return json.dumps(report, indent=2)
+        # Summary lines are collected and written to stdout in one go
+        with self._buffered_output():
+            self.section_header("Summary")
+            self.log(f"Total Checks: {total}")
+            self.log(f"  ✓ OK:       {ok_count}", Colors.OKGREEN)
+            self.log(f"  ⚠ Warning:  {warning_count}", Colors.WARNING)
+            self.log(f"  ✗ Failed:   {fail_count}", Colors.FAIL)
+            self.log(f"  ℹ Info:     {info_count}", Colors.OKBLUE)
+            
+            duration = time.time() - self.start_ts
+            self.log(f"\nDuration: {duration:.2f} seconds")
+            
+            # Overall health status
+            if fail_count > 0:
+                health = "CRITICAL"
+                health_color = Colors.FAIL
+            elif warning_count > 3:
+                health = "NEEDS ATTENTION"
+                health_color = Colors.WARNING
+            elif warning_count > 0:
+                health = "GOOD"
+                health_color = Colors.WARNING
+            else:
+                health = "EXCELLENT"
+                health_color = Colors.OKGREEN
+            
+            self.log(f"\nOverall Health: {health}", health_color + Colors.BOLD)
+            
+            # Generate JSON report
+            report = {
+                "timestamp": self.start_time.isoformat(),
+                "duration_seconds": duration,
+                "platform": {
+                    "system": platform.system(),
+                    "release": platform.release(),
+                    "machine": platform.machine(),
+                },
+                "summary": {
+                    "total": total,
+                    "ok": ok_count,
+                    "warning": warning_count,
+                    "fail": fail_count,
+                    "info": info_count,
+                    "health": health
+                },
+                "results": [r.to_dict() for r in self.results]
+            }
+            
+            # Encode once; the same bytes are written to disk and returned
+            if orjson is not None:
+                payload = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(report, indent=2).encode('utf-8')
+            
+            # Save to file if specified
+            if output_file:
+                try:
+                    Path(output_file).write_bytes(payload)
+                    self.log(f"\n{Colors.OKGREEN}Report saved to: {output_file}{Colors.ENDC}")
+                except Exception as e:
+                    self.log(f"\n{Colors.FAIL}Failed to save report: {e}{Colors.ENDC}")
+            
+            return payload
     
     # ==================== Main Execution ====================
     
     def run_all_checks(self):
         """Run all diagnostic checks with comprehensive error handling"""
-        self.log(f"{Colors.HEADER}{Colors.BOLD}")
-        self.log("╔════════════════════════════════════════════════════════════════════════════╗")
-        self.log("║                  AI FILE SORTER - DIAGNOSTIC TOOL                          ║")
-        self.log("║                     Comprehensive System Check                             ║")
-        self.log("╚════════════════════════════════════════════════════════════════════════════╝")
-        self.log(Colors.ENDC)
+        with self._buffered_output():
+            self.log(f"{Colors.HEADER}{Colors.BOLD}")
+            self.log("╔════════════════════════════════════════════════════════════════════════════╗")
+            self.log("║                  AI FILE SORTER - DIAGNOSTIC TOOL                          ║")
+            self.log("║                     Comprehensive System Check                             ║")
+            self.log("╚════════════════════════════════════════════════════════════════════════════╝")
+            self.log(Colors.ENDC)
         
         # List of all check methods
         check_methods = [
@@ -899,62 +1031,92 @@ class DiagnosticTool:
             ('Performance', self.check_performance),
         ]
         
-        # Run all checks, logging errors but continuing
-        for check_name, check_method in check_methods:
-            try:
-                check_method()
-            except KeyboardInterrupt:
-                self.log(f"\n{Colors.WARNING}Diagnostic interrupted by user{Colors.ENDC}")
-                self.add_result(
-                    f"{check_name} Check",
-                    "FAIL",
-                    "Interrupted by user",
-                    "Diagnostic was cancelled before completion"
-                )
-                sys.exit(1)
-            except Exception as e:
-                self.log(f"\n{Colors.FAIL}Error in {check_name} check: {e}{Colors.ENDC}")
-                
-                # Log the error but continue with other checks
-                import traceback
-                error_details = traceback.format_exc()
+        # Checks are independent and I/O-bound (stat calls, subprocesses), so
+        # run them concurrently and replay their buffered output in order
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                (check_name, executor.submit(self._run_check, check_method))
+                for check_name, check_method in check_methods
+            ]
+            
+            # Run all checks, logging errors but continuing
+            for check_name, future in futures:
+                try:
+                    lines, results, error = future.result()
+                except KeyboardInterrupt:
+                    self.log(f"\n{Colors.WARNING}Diagnostic interrupted by user{Colors.ENDC}")
+                    self.add_result(
+                        f"{check_name} Check",
+                        "FAIL",
+                        "Interrupted by user",
+                        "Diagnostic was cancelled before completion"
+                    )
+                    for _, pending in futures:
+                        pending.cancel()
+                    sys.exit(1)
                 
-                self.add_result(
-                    f"{check_name} Check",
-                    "FAIL",
-                    f"Check failed with error: {str(e)}",
-                    error_details
-                )
+                if lines:
+                    sys.stdout.write("\n".join(lines) + "\n")
+                self.results.extend(results)
                 
-                if self.verbose:
-                    self.log(f"{Colors.FAIL}Traceback:{Colors.ENDC}", Colors.FAIL)
-                    self.log(error_details)
+                if error is not None:
+                    e, error_details = error
+                    self.log(f"\n{Colors.FAIL}Error in {check_name} check: {e}{Colors.ENDC}")
+                    
+                    # Log the error but continue with other checks
+                    self.add_result(
+                        f"{check_name} Check",
+                        "FAIL",
+                        f"Check failed with error: {str(e)}",
+                        error_details
+                    )
+                    
+                    if self.verbose:
+                        self.log(f"{Colors.FAIL}Traceback:{Colors.ENDC}", Colors.FAIL)
+                        self.log(error_details)
+    
+    def _run_check(self, check_method):
+        """Run one check in a worker thread, buffering its output and results"""
+        self._local.lines = []
+        self._local.results = []
+        error = None
+        try:
+            check_method()
+        except Exception as e:
+            error = (e, traceback.format_exc())
+        finally:
+            lines, results = self._local.lines, self._local.results
+            del self._local.lines, self._local.results
+        return lines, results, error
+
+
+# Built once at import so repeated main() calls reuse it
+_PARSER = argparse.ArgumentParser(
+    description="AI File Sorter - Comprehensive Diagnostic Tool"
+)
+_PARSER.add_argument(
+    "-v", "--verbose",
+    action="store_true",
+    help="Enable verbose output with detailed information"
+)
+_PARSER.add_argument(
+    "-o", "--output",
+    type=str,
+    help="Save diagnostic report to specified JSON file"
+)
 
 
 def main():
     """Main entry point"""
-    parser = argparse.ArgumentParser(
-        description="AI File Sorter - Comprehensive Diagnostic Tool"
-    )
-    parser.add_argument(
-        "-v", "--verbose",
-        action="store_true",
-        help="Enable verbose output with detailed information"
-    )
-    parser.add_argument(
-        "-o", "--output",
-        type=str,
-        help="Save diagnostic report to specified JSON file"
-    )
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     # Create and run diagnostic tool
     tool = DiagnosticTool(verbose=args.verbose)
     tool.run_all_checks()
     
     # Generate report
-    default_output = f"diagnostic_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(tool.start_ts))
+    default_output = f"diagnostic_report_{stamp}.json"
     output_file = args.output or default_output
     tool.generate_report(output_file)
 
@@ -7,41 +7,158 @@ Aggregates and analyzes multiple diagnostic reports to track health over time.
 Usage:
     python3 test_aggregator.py [report1.json report2.json ...]
     python3 test_aggregator.py --directory diagnostics/ --output summary.html
+    python3 test_aggregator.py --directory diagnostics/ --jobs 8
 """
 
 import json
 import sys
-import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Optional
+from collections import Counter, defaultdict
+from itertools import islice
+
+try:
+    import orjson  # Optional: much faster JSON parsing when loading reports
+except ImportError:
+    orjson = None
+
+__all__ = ['TestAggregator', 'ReportRow']
+
+# Numeric ranks used to tell improvements from regressions (unknown -> 0)
+_HEALTH_SCORE = {
+    'EXCELLENT': 4,
+    'GOOD': 3,
+    'NEEDS ATTENTION': 2,
+    'CRITICAL': 1
+}
+_STATUS_SCORE = {
+    'OK': 4,
+    'INFO': 3,
+    'WARNING': 2,
+    'FAIL': 1
+}
+
+# CSS class suffix per health value; others are derived from the value itself
+_HEALTH_CLASS = {
+    'EXCELLENT': 'excellent',
+    'GOOD': 'good',
+    'NEEDS ATTENTION': 'needs-attention',
+    'CRITICAL': 'critical'
+}
+
+# One row of the HTML health trend table (%-formatted once per report)
+_TREND_ROW_HTML = """
+            <tr>
+                <td>%s</td>
+                <td><span class="status status-%s">%s</span></td>
+                <td>%s</td>
+                <td>%s</td>
+                <td>%s</td>
+                <td>%s</td>
+            </tr>
+"""
+
+def _write_lines(lines: List[str]):
+    """Emit a block of output lines with a single stdout write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+class ReportRow:
+    """Flat view of one diagnostic report, holding only what the analyzers read"""
+    __slots__ = ("file", "timestamp", "ts_dt", "duration", "health", "ok", "warning", "fail", "total",
+                 "fail_names", "warn_names", "status_by_name")
+    
+    def __init__(self, file_path: str, report: Dict[str, Any]):
+        summary = report.get('summary', {})
+        results = report.get('results', [])
+        
+        self.file = file_path
+        self.timestamp = report.get('timestamp', '')
+        # Parsed once here; the date range is formatted from it on every call
+        try:
+            self.ts_dt = datetime.fromisoformat(self.timestamp) if self.timestamp else None
+        except ValueError:
+            self.ts_dt = None
+        duration = report.get('duration_seconds', 0)
+        # A null or non-numeric duration is kept as None and left out of the
+        # run-time statistics; the rest of the report is still analyzed
+        self.duration = duration if isinstance(duration, (int, float)) else None
+        self.health = summary.get('health', '')  # 'Unknown' is substituted only for display
+        self.ok = summary.get('ok', 0)
+        self.warning = summary.get('warning', 0)
+        self.fail = summary.get('fail', 0)
+        self.total = summary.get('total', 0)
+        
+        # Per-result data, extracted once so the raw tree can be dropped
+        self.fail_names: List[str] = []
+        self.warn_names: List[str] = []
+        self.status_by_name: Dict[str, str] = {}
+        for result in results:
+            name = result.get('name', 'Unknown')
+            status = result.get('status')
+            self.status_by_name[name] = status
+            if status == 'WARNING':
+                self.warn_names.append(name)
+            elif status == 'FAIL':
+                self.fail_names.append(name)
 
 class TestAggregator:
     """Aggregates and analyzes multiple test reports"""
     
     def __init__(self):
-        self.reports: List[Dict[str, Any]] = []
+        self.reports: List[ReportRow] = []
         self.summary = defaultdict(list)
+        
+        # Running duration aggregates, updated as each report loads
+        self._dur_count = 0
+        self._dur_sum = 0.0
+        self._dur_min = float('inf')
+        self._dur_max = float('-inf')
+        self._sorted = True  # Cleared whenever a report is loaded
     
-    def load_report(self, file_path: str) -> bool:
-        """Load a diagnostic report JSON file"""
+    def load_report(self, file_path: str, raw: Optional[bytes] = None) -> bool:
+        """Load a diagnostic report JSON file (raw: its contents, if already read)"""
         try:
-            with open(file_path, 'r') as f:
-                report = json.load(f)
-                self.reports.append({
-                    'file': file_path,
-                    'data': report
-                })
-                return True
+            if raw is None:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+            report = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            row = ReportRow(file_path, report)
+            self.reports.append(row)
+            self._sorted = False
+            if row.duration is not None:
+                self._dur_count += 1
+                self._dur_sum += row.duration
+                self._dur_min = min(self._dur_min, row.duration)
+                self._dur_max = max(self._dur_max, row.duration)
+            return True
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             return False
     
-    def load_directory(self, directory: str) -> int:
-        """Load all JSON reports from a directory"""
+    def load_directory(self, directory: str, jobs: int = 1) -> int:
+        """Load all JSON reports from a directory, reading with up to `jobs` threads"""
+        json_files = list(Path(directory).glob("*.json"))
         count = 0
-        for json_file in Path(directory).glob("*.json"):
+        
+        if jobs > 1 and len(json_files) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            # File reads overlap on worker threads; parsing stays on this
+            # thread and follows directory order
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(json_file.read_bytes) for json_file in json_files]
+                for json_file, future in zip(json_files, futures):
+                    try:
+                        raw = future.result()
+                    except Exception as e:
+                        print(f"Error loading {json_file}: {e}")
+                        continue
+                    if self.load_report(str(json_file), raw):
+                        count += 1
+            return count
+        
+        for json_file in json_files:
             if self.load_report(str(json_file)):
                 count += 1
         return count
@@ -52,15 +169,18 @@ class TestAggregator:
             print("No reports loaded")
             return
         
-        print("\n" + "="*80)
-        print("TEST RESULT AGGREGATION AND ANALYSIS")
-        print("="*80)
-        
-        # Sort by timestamp
-        self.reports.sort(key=lambda r: r['data'].get('timestamp', ''))
+        # Sort by timestamp, only if reports were loaded since the last sort
+        if not self._sorted:
+            self.reports.sort(key=lambda r: r.timestamp)
+            self._sorted = True
         
-        print(f"\nTotal Reports: {len(self.reports)}")
-        print(f"Date Range: {self._get_date_range()}")
+        _write_lines([
+            "\n" + "="*80,
+            "TEST RESULT AGGREGATION AND ANALYSIS",
+            "="*80,
+            f"\nTotal Reports: {len(self.reports)}",
+            f"Date Range: {self._get_date_range()}",
+        ])
         
         self._analyze_health_trend()
         self._analyze_common_issues()
@@ -72,31 +192,24 @@ class TestAggregator:
         if not self.reports:
             return "N/A"
         
-        dates = [r['data'].get('timestamp', '') for r in self.reports if r['data'].get('timestamp')]
-        if not dates:
+        # Only the ends matter: scan in from each side for a parsed timestamp
+        first_dt = next((r.ts_dt for r in self.reports if r.ts_dt is not None), None)
+        if first_dt is None:
             return "N/A"
+        last_dt = next(r.ts_dt for r in reversed(self.reports) if r.ts_dt is not None)
         
-        first = datetime.fromisoformat(dates[0]).strftime('%Y-%m-%d %H:%M')
-        last = datetime.fromisoformat(dates[-1]).strftime('%Y-%m-%d %H:%M')
+        first = first_dt.strftime('%Y-%m-%d %H:%M')
+        last = last_dt.strftime('%Y-%m-%d %H:%M')
         
         return f"{first} to {last}"
     
     def _analyze_health_trend(self):
         """Analyze overall health trend"""
-        print("\n" + "-"*80)
-        print("HEALTH TREND")
-        print("-"*80)
-        
-        for i, report in enumerate(self.reports, 1):
-            data = report['data']
-            summary = data.get('summary', {})
-            timestamp = data.get('timestamp', 'Unknown')
-            health = summary.get('health', 'Unknown')
-            
-            ok = summary.get('ok', 0)
-            warn = summary.get('warning', 0)
-            fail = summary.get('fail', 0)
-            total = summary.get('total', 0)
+        lines = ["\n" + "-"*80, "HEALTH TREND", "-"*80]
+        
+        for i, row in enumerate(self.reports, 1):
+            timestamp = row.timestamp or 'Unknown'
+            health = row.health or 'Unknown'
             
             # Health indicator
             if health == 'EXCELLENT':
@@ -108,161 +221,135 @@ class TestAggregator:
             else:
                 indicator = '🔴'
             
-            print(f"{i}. {timestamp[:19]} {indicator} {health}")
-            print(f"   OK: {ok}/{total}, Warnings: {warn}, Failures: {fail}")
+            lines.append(f"{i}. {timestamp[:19]} {indicator} {health}")
+            lines.append(f"   OK: {row.ok}/{row.total}, Warnings: {row.warning}, Failures: {row.fail}")
         
         # Trend analysis
         if len(self.reports) > 1:
-            first_health = self.reports[0]['data'].get('summary', {}).get('health', '')
-            last_health = self.reports[-1]['data'].get('summary', {}).get('health', '')
+            first_health = self.reports[0].health
+            last_health = self.reports[-1].health
             
-            print(f"\nTrend: {first_health} → {last_health}")
+            lines.append(f"\nTrend: {first_health} → {last_health}")
             
             if last_health == first_health:
-                print("Status: Stable")
-            elif self._health_score(last_health) > self._health_score(first_health):
-                print("Status: Improving ✅")
+                lines.append("Status: Stable")
+            elif _HEALTH_SCORE.get(last_health, 0) > _HEALTH_SCORE.get(first_health, 0):
+                lines.append("Status: Improving ✅")
             else:
-                print("Status: Degrading ⚠️")
-    
-    def _health_score(self, health: str) -> int:
-        """Convert health status to numeric score"""
-        scores = {
-            'EXCELLENT': 4,
-            'GOOD': 3,
-            'NEEDS ATTENTION': 2,
-            'CRITICAL': 1
-        }
-        return scores.get(health, 0)
+                lines.append("Status: Degrading ⚠️")
+        
+        _write_lines(lines)
     
     def _analyze_common_issues(self):
         """Analyze common issues across reports"""
-        print("\n" + "-"*80)
-        print("COMMON ISSUES")
-        print("-"*80)
+        lines = ["\n" + "-"*80, "COMMON ISSUES", "-"*80]
         
         # Count warnings and failures by name
-        warnings = defaultdict(int)
-        failures = defaultdict(int)
+        warnings = Counter()
+        failures = Counter()
         
-        for report in self.reports:
-            results = report['data'].get('results', [])
-            for result in results:
-                if result.get('status') == 'WARNING':
-                    warnings[result.get('name', 'Unknown')] += 1
-                elif result.get('status') == 'FAIL':
-                    failures[result.get('name', 'Unknown')] += 1
+        for row in self.reports:
+            warnings.update(row.warn_names)
+            failures.update(row.fail_names)
         
         if failures:
-            print("\nMost Common Failures:")
-            for issue, count in sorted(failures.items(), key=lambda x: -x[1])[:5]:
+            lines.append("\nMost Common Failures:")
+            for issue, count in failures.most_common(5):
                 pct = (count / len(self.reports)) * 100
-                print(f"  • {issue}: {count}/{len(self.reports)} reports ({pct:.1f}%)")
+                lines.append(f"  • {issue}: {count}/{len(self.reports)} reports ({pct:.1f}%)")
         else:
-            print("\n✅ No recurring failures")
+            lines.append("\n✅ No recurring failures")
         
         if warnings:
-            print("\nMost Common Warnings:")
-            for issue, count in sorted(warnings.items(), key=lambda x: -x[1])[:5]:
+            lines.append("\nMost Common Warnings:")
+            for issue, count in warnings.most_common(5):
                 pct = (count / len(self.reports)) * 100
-                print(f"  • {issue}: {count}/{len(self.reports)} reports ({pct:.1f}%)")
+                lines.append(f"  • {issue}: {count}/{len(self.reports)} reports ({pct:.1f}%)")
         else:
-            print("\n✅ No recurring warnings")
+            lines.append("\n✅ No recurring warnings")
+        
+        _write_lines(lines)
     
     def _analyze_performance(self):
         """Analyze performance metrics"""
-        print("\n" + "-"*80)
-        print("PERFORMANCE METRICS")
-        print("-"*80)
+        lines = ["\n" + "-"*80, "PERFORMANCE METRICS", "-"*80]
         
-        durations = [r['data'].get('duration_seconds', 0) for r in self.reports]
+        count = self._dur_count  # Reports with a usable duration
         
-        if durations:
-            avg_duration = sum(durations) / len(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
+        if count:
+            avg_duration = self._dur_sum / count
             
-            print(f"\nDiagnostic Run Time:")
-            print(f"  Average: {avg_duration:.2f}s")
-            print(f"  Min: {min_duration:.2f}s")
-            print(f"  Max: {max_duration:.2f}s")
-        
-        # Check for performance trends
-        if len(durations) > 1:
-            first_half = durations[:len(durations)//2]
-            second_half = durations[len(durations)//2:]
+            lines.append(f"\nDiagnostic Run Time:")
+            lines.append(f"  Average: {avg_duration:.2f}s")
+            lines.append(f"  Min: {self._dur_min:.2f}s")
+            lines.append(f"  Max: {self._dur_max:.2f}s")
+        
+        # Check for performance trends (reports are in timestamp order)
+        if count > 1:
+            half = count // 2
+            timed = (r.duration for r in self.reports if r.duration is not None)
+            first_sum = sum(islice(timed, half))
             
-            avg_first = sum(first_half) / len(first_half)
-            avg_second = sum(second_half) / len(second_half)
+            avg_first = first_sum / half
+            avg_second = (self._dur_sum - first_sum) / (count - half)
             
             if avg_second < avg_first * 0.9:
-                print("\n✅ Performance improving over time")
+                lines.append("\n✅ Performance improving over time")
             elif avg_second > avg_first * 1.1:
-                print("\n⚠️ Performance degrading over time")
+                lines.append("\n⚠️ Performance degrading over time")
             else:
-                print("\n→ Performance stable")
+                lines.append("\n→ Performance stable")
+        
+        _write_lines(lines)
     
     def _analyze_feature_status(self):
         """Analyze feature status across reports"""
-        print("\n" + "-"*80)
-        print("FEATURE STATUS")
-        print("-"*80)
+        lines = ["\n" + "-"*80, "FEATURE STATUS", "-"*80]
         
         # Find features that were recently fixed or broken
         if len(self.reports) < 2:
-            print("\nNeed at least 2 reports for trend analysis")
+            lines.append("\nNeed at least 2 reports for trend analysis")
+            _write_lines(lines)
             return
         
-        latest = self.reports[-1]['data'].get('results', [])
-        previous = self.reports[-2]['data'].get('results', [])
-        
-        # Create lookup by name
-        latest_lookup = {r['name']: r['status'] for r in latest}
-        previous_lookup = {r['name']: r['status'] for r in previous}
+        # Name -> status lookups, built once at load time
+        latest_lookup = self.reports[-1].status_by_name
+        previous_lookup = self.reports[-2].status_by_name
         
         improved = []
         degraded = []
         
-        for name in latest_lookup:
-            if name not in previous_lookup:
-                continue
-            
-            prev_status = previous_lookup[name]
-            curr_status = latest_lookup[name]
+        for name, curr_status in latest_lookup.items():
+            # Names missing from the previous report default to "unchanged"
+            prev_status = previous_lookup.get(name, curr_status)
             
             # Check if status changed
             if prev_status != curr_status:
-                if self._status_score(curr_status) > self._status_score(prev_status):
+                if _STATUS_SCORE.get(curr_status, 0) > _STATUS_SCORE.get(prev_status, 0):
                     improved.append(name)
                 else:
                     degraded.append(name)
         
         if improved:
-            print("\n✅ Recently Improved:")
+            lines.append("\n✅ Recently Improved:")
             for name in improved:
-                print(f"  • {name}: {previous_lookup[name]} → {latest_lookup[name]}")
+                lines.append(f"  • {name}: {previous_lookup[name]} → {latest_lookup[name]}")
         
         if degraded:
-            print("\n⚠️ Recently Degraded:")
+            lines.append("\n⚠️ Recently Degraded:")
             for name in degraded:
-                print(f"  • {name}: {previous_lookup[name]} → {latest_lookup[name]}")
+                lines.append(f"  • {name}: {previous_lookup[name]} → {latest_lookup[name]}")
         
         if not improved and not degraded:
-            print("\n→ No status changes in latest report")
-    
-    def _status_score(self, status: str) -> int:
-        """Convert status to numeric score"""
-        scores = {
-            'OK': 4,
-            'INFO': 3,
-            'WARNING': 2,
-            'FAIL': 1
-        }
-        return scores.get(status, 0)
+            lines.append("\n→ No status changes in latest report")
+        
+        _write_lines(lines)
     
     def generate_html_report(self, output_file: str):
         """Generate HTML summary report"""
-        html = f"""
+        import html  # Only needed when an HTML report is requested
+        
+        parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -341,12 +428,12 @@ class TestAggregator:
         <p>Reports Analyzed: {len(self.reports)}</p>
         <p>Date Range: {self._get_date_range()}</p>
     </div>
-"""
+"""]
         
         # Summary cards
         if self.reports:
-            latest = self.reports[-1]['data'].get('summary', {})
-            html += """
+            latest = self.reports[-1]
+            parts.append("""
     <div class="summary">
         <div class="card">
             <h3>Overall Health</h3>
@@ -366,15 +453,15 @@ class TestAggregator:
         </div>
     </div>
 """.format(
-                latest.get('health', 'Unknown'),
-                latest.get('ok', 0),
-                latest.get('total', 0),
-                latest.get('warning', 0),
-                latest.get('fail', 0)
-            )
+                html.escape(latest.health or 'Unknown'),
+                latest.ok,
+                latest.total,
+                latest.warning,
+                latest.fail
+            ))
         
         # Health trend table
-        html += """
+        parts.append("""
     <div class="card">
         <h3>Health Trend</h3>
         <table>
@@ -386,42 +473,43 @@ class TestAggregator:
                 <th>Failures</th>
                 <th>Total</th>
             </tr>
-"""
+""")
         
-        for report in self.reports:
-            data = report['data']
-            summary = data.get('summary', {})
-            timestamp = data.get('timestamp', 'Unknown')[:19]
-            health = summary.get('health', 'Unknown')
+        for row in self.reports:
+            timestamp = (row.timestamp or 'Unknown')[:19]
+            health = row.health or 'Unknown'
             
-            html += f"""
-            <tr>
-                <td>{timestamp}</td>
-                <td><span class="status status-{health.lower().replace(' ', '-')}">{health}</span></td>
-                <td>{summary.get('ok', 0)}</td>
-                <td>{summary.get('warning', 0)}</td>
-                <td>{summary.get('fail', 0)}</td>
-                <td>{summary.get('total', 0)}</td>
-            </tr>
-"""
+            css_class = _HEALTH_CLASS.get(health) or health.lower().replace(' ', '-')
+            
+            parts.append(_TREND_ROW_HTML % (
+                html.escape(timestamp),
+                html.escape(css_class),
+                html.escape(health),
+                row.ok,
+                row.warning,
+                row.fail,
+                row.total
+            ))
         
-        html += """
+        parts.append("""
         </table>
     </div>
-"""
+""")
         
-        html += """
+        parts.append("""
 </body>
 </html>
-"""
+""")
         
         with open(output_file, 'w') as f:
-            f.write(html)
+            f.write(''.join(parts))
         
         print(f"\n✅ HTML report saved to: {output_file}")
 
 
 def main():
+    import argparse  # CLI-only; keeps importing TestAggregator lightweight
+    
     parser = argparse.ArgumentParser(
         description="AI File Sorter - Test Result Aggregator"
     )
@@ -438,6 +526,12 @@ def main():
         '-o', '--output',
         help='Output HTML report file'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Threads used to read reports with --directory (default: 1)'
+    )
     
     args = parser.parse_args()
     
@@ -445,7 +539,7 @@ def main():
     
     # Load reports
     if args.directory:
-        count = aggregator.load_directory(args.directory)
+        count = aggregator.load_directory(args.directory, jobs=args.jobs)
         print(f"Loaded {count} reports from {args.directory}")
     
     for report_file in args.reports:
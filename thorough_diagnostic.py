@@ -28,6 +28,7 @@ Options:
     --test-apis            Test API connectivity (requires keys)
     --benchmark            Run performance benchmarks
     --quick                Skip slow tests (for rapid validation)
+    --compact              Write the JSON report without indentation
 """
 
 import os
@@ -35,15 +36,22 @@ import sys
 import json
 import platform
 import subprocess
-import sqlite3
 import datetime
 import argparse
 import time
-import hashlib
 import re
+import functools
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-from collections import defaultdict
+from typing import Dict, FrozenSet, List, Tuple, Optional, Any
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+try:
+    import orjson  # Optional: much faster JSON encoding for the report
+except ImportError:
+    orjson = None
 
 # ANSI color codes for terminal output
 class Colors:
@@ -57,8 +65,26 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Piped output (log files, CI) gets plain text instead of escape codes
+if not (sys.stdout and sys.stdout.isatty()):
+    for _name in ('HEADER', 'OKBLUE', 'OKCYAN', 'OKGREEN', 'WARNING',
+                  'FAIL', 'ENDC', 'BOLD', 'UNDERLINE'):
+        setattr(Colors, _name, '')
+
+# Color and line prefix per result status, built once after the TTY check
+_STATUS_META = {
+    "OK": (Colors.OKGREEN, "  ✓ "),
+    "WARNING": (Colors.WARNING, "  ⚠ "),
+    "FAIL": (Colors.FAIL, "  ✗ "),
+    "INFO": (Colors.OKBLUE, "  ℹ "),
+    "SKIP": (Colors.OKCYAN, "  ⊘ "),
+}
+_DEFAULT_STATUS_META = ("", "  • ")
+
 class DiagnosticResult:
     """Stores the result of a diagnostic check"""
+    __slots__ = ("name", "status", "message", "details", "recommendation", "t_ns", "category")
+    
     def __init__(self, name: str, status: str, message: str, 
                  details: Optional[str] = None, recommendation: Optional[str] = None):
         self.name = name
@@ -66,9 +92,131 @@ class DiagnosticResult:
         self.message = message
         self.details = details
         self.recommendation = recommendation
-        self.timestamp = datetime.datetime.now().isoformat()
+        self.t_ns = time.monotonic_ns()  # Converted to wall-clock time in the report
         self.category = ""  # Will be set by diagnostic sections
 
+# Features mapped to (name, implementation file, is core feature)
+FEATURE_SOURCES = (
+    ("Core Categorization", "app/lib/CategorizationService.cpp", True),
+    ("File Scanner", "app/lib/FileScanner.cpp", True),
+    ("Database Manager", "app/lib/DatabaseManager.cpp", True),
+    ("LLM Client Interface", "app/lib/LLMClient.cpp", True),
+    ("Local LLM Client", "app/lib/LocalLLMClient.cpp", True),
+    ("OpenAI Client", "app/lib/LLMClient.cpp", True),
+    ("Gemini Client", "app/lib/GeminiClient.cpp", True),
+    ("Categorization Dialog", "app/lib/CategorizationDialog.cpp", True),
+    ("User Profile Manager", "app/lib/UserProfileManager.cpp", False),
+    ("User Profile Dialog", "app/lib/UserProfileDialog.cpp", False),
+    ("Folder Learning", "app/lib/FolderLearningDialog.cpp", False),
+    ("File Tinder", "app/lib/FileTinderDialog.cpp", False),
+    ("Cache Manager", "app/lib/CacheManagerDialog.cpp", False),
+    ("Undo Manager", "app/lib/UndoManager.cpp", False),
+    ("Dry Run Preview", "app/lib/DryRunPreviewDialog.cpp", False),
+    ("Whitelist Manager", "app/lib/WhitelistManagerDialog.cpp", False),
+    ("Custom LLM Dialog", "app/lib/CustomLLMDialog.cpp", False),
+    ("LLM Selection Dialog", "app/lib/LLMSelectionDialog.cpp", True),
+    ("API Usage Statistics", "app/lib/UsageStatsDialog.cpp", False),
+    ("Translation Manager", "app/lib/TranslationManager.cpp", False),
+    ("Consistency Service", "app/lib/ConsistencyPassService.cpp", False),
+    ("Categorization Progress", "app/lib/CategorizationProgressDialog.cpp", True),
+)
+
+@functools.lru_cache(maxsize=None)
+def _source_file_stats(path: str) -> Optional[Tuple[int, int]]:
+    """Return (size in bytes, line count) of a source file, or None if missing.
+    
+    Cached per path because several features share one implementation file.
+    """
+    try:
+        # Open directly (no stat first) and count newlines on the raw bytes
+        with open(path, 'rb') as f:
+            data = f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError:
+        # Present but unreadable: report the size without a line count
+        try:
+            return os.stat(path).st_size, 0
+        except OSError:
+            return None
+    lines = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        lines += 1  # Last line without a trailing newline
+    return len(data), lines
+
+def _walk_stats(root) -> Tuple[int, int]:
+    """Return (file count, total bytes) under root in a single os.scandir walk"""
+    count = size = 0
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    # One unstat-able entry (e.g. deleted mid-walk) is skipped
+                    # without losing the rest of the listing
+                    try:
+                        size += entry.stat().st_size
+                    except OSError:
+                        continue
+                    count += 1
+    return count, size
+
+# Provider name followed by "key" later on the same line; the lookahead does
+# not consume, so "openai ... gemini ... key" still reports both providers
+_API_KEY_RE = re.compile(rb'(openai|gemini)(?=.*key)', re.I)
+
+# Settings reported by check_configuration, matched against the raw config bytes
+_CONFIG_PATTERNS = (
+    ("Language", re.compile(rb'language\s*=', re.I)),
+    ("Theme", re.compile(rb'theme\s*=', re.I)),
+    ("LLM Model", re.compile(rb'llm.*model', re.I)),
+)
+
+def _sizes_by_suffix(directory: str, suffixes: Tuple[str, ...]) -> List[Tuple[str, int]]:
+    """(name, size) of the entries in directory whose name ends with a suffix.
+    
+    A single os.scandir pass on plain strings; no Path objects per file.
+    Entries that cannot be stat()'d (e.g. dangling symlinks) are skipped.
+    """
+    sizes = []
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return sizes
+    with it:
+        for e in it:
+            if os.path.normcase(e.name).endswith(suffixes):
+                try:
+                    sizes.append((e.name, e.stat().st_size))
+                except OSError:
+                    continue
+    return sizes
+
+_PROBE_SEP = "\n---probe "
+
+def _run_probes(commands: List[str], timeout: int = 5) -> List[Tuple[int, str]]:
+    """Run shell commands in one /bin/sh and return (exit code, stdout) per command"""
+    script = "; ".join(
+        f"{cmd} 2>/dev/null; printf '\\n---probe %d\\n' $?" for cmd in commands
+    )
+    proc = subprocess.run(
+        ["/bin/sh", "-c", script],
+        capture_output=True, text=True, timeout=timeout * len(commands)
+    )
+    results = []
+    rest = proc.stdout
+    for _ in commands:
+        chunk, _, rest = rest.partition(_PROBE_SEP)
+        code, _, rest = rest.partition("\n")
+        results.append((int(code) if code.isdigit() else 127, chunk))
+    return results
+
 class ThoroughDiagnosticTool:
     """Comprehensive diagnostic tool for AI File Sorter"""
     
@@ -76,12 +224,21 @@ class ThoroughDiagnosticTool:
         self.verbose = verbose
         self.quick = quick
         self.results: List[DiagnosticResult] = []
-        self.platform = platform.system()
+        # One uname() snapshot serves every platform lookup for the run
+        self._uname = platform.uname()
+        self.platform = self._uname.system
         self.start_time = datetime.datetime.now()
+        self._t0_ns = time.monotonic_ns()
         self.categories: Dict[str, List[DiagnosticResult]] = defaultdict(list)
         
+        # Per-thread output/result buffers used while checks run in parallel
+        self._local = threading.local()
+        
         # Determine base directories
         self.repo_root = Path.cwd()
+        self.repo_root_str = str(self.repo_root)  # For pathlib-free hot paths
+        self._dir_names_cache: Dict[str, FrozenSet[str]] = {}
+        self._disk_usage_cache = None
         if self.platform == "Windows":
             self.app_dir = self.repo_root / "app" / "build-windows" / "Release"
             if not self.app_dir.exists():
@@ -104,10 +261,24 @@ class ThoroughDiagnosticTool:
     
     def log(self, message: str, color: str = ""):
         """Print a log message"""
-        if color:
-            print(f"{color}{message}{Colors.ENDC}")
+        line = f"{color}{message}{Colors.ENDC}" if color else message
+        lines = getattr(self._local, "lines", None)
+        if lines is not None:
+            lines.append(line)
         else:
-            print(message)
+            print(line)
+    
+    @contextmanager
+    def _buffered_output(self):
+        """Collect log lines in the block and emit them with a single write"""
+        self._local.lines = []
+        try:
+            yield
+        finally:
+            lines = self._local.lines
+            del self._local.lines
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
     
     def add_result(self, name: str, status: str, message: str, 
                    details: Optional[str] = None, recommendation: Optional[str] = None,
@@ -115,27 +286,15 @@ class ThoroughDiagnosticTool:
         """Add a diagnostic result"""
         result = DiagnosticResult(name, status, message, details, recommendation)
         result.category = category
-        self.results.append(result)
-        self.categories[category].append(result)
+        buffered = getattr(self._local, "results", None)
+        if buffered is not None:
+            buffered.append(result)
+        else:
+            self._record(result)
         
         # Print result
-        status_color = {
-            "OK": Colors.OKGREEN,
-            "WARNING": Colors.WARNING,
-            "FAIL": Colors.FAIL,
-            "INFO": Colors.OKBLUE,
-            "SKIP": Colors.OKCYAN
-        }.get(status, "")
-        
-        status_symbol = {
-            "OK": "✓",
-            "WARNING": "⚠",
-            "FAIL": "✗",
-            "INFO": "ℹ",
-            "SKIP": "⊘"
-        }.get(status, "•")
-        
-        self.log(f"  {status_symbol} {name}: {message}", status_color)
+        status_color, prefix = _STATUS_META.get(status, _DEFAULT_STATUS_META)
+        self.log(prefix + name + ": " + message, status_color)
         
         if self.verbose and details:
             self.log(f"    Details: {details}", Colors.OKCYAN)
@@ -143,12 +302,40 @@ class ThoroughDiagnosticTool:
         if recommendation and (status == "WARNING" or status == "FAIL"):
             self.log(f"    💡 Recommendation: {recommendation}", Colors.OKBLUE)
     
+    def _record(self, result: DiagnosticResult):
+        """Store a finished result in run order"""
+        self.results.append(result)
+        self.categories[result.category].append(result)
+    
     def section_header(self, title: str):
         """Print a section header"""
         self.log(f"\n{'='*80}", Colors.HEADER)
         self.log(f"{title.upper()}", Colors.HEADER + Colors.BOLD)
         self.log(f"{'='*80}", Colors.HEADER)
     
+    def _dir_names(self, rel_dir: str) -> FrozenSet[str]:
+        """Entry names of a repo directory, listed once per run with os.scandir"""
+        names = self._dir_names_cache.get(rel_dir)
+        if names is None:
+            try:
+                with os.scandir(os.path.join(self.repo_root_str, rel_dir)) as it:
+                    names = frozenset(os.path.normcase(e.name) for e in it)
+            except OSError:
+                names = frozenset()
+            self._dir_names_cache[rel_dir] = names
+        return names
+    
+    def _disk_usage(self):
+        """shutil.disk_usage of the drive holding user data, queried once per run"""
+        if self._disk_usage_cache is None:
+            import shutil
+            if self.platform == "Windows":
+                drive = Path.cwd().drive
+                self._disk_usage_cache = shutil.disk_usage(drive if drive else "/")
+            else:
+                self._disk_usage_cache = shutil.disk_usage(str(Path.home()))
+        return self._disk_usage_cache
+    
     # ==================== System Information ====================
     
     def check_system_info(self):
@@ -157,11 +344,12 @@ class ThoroughDiagnosticTool:
         category = "System"
         
         # Platform details
+        uname = self._uname
         self.add_result(
             "Operating System",
             "INFO",
-            f"{platform.system()} {platform.release()} ({platform.version()})",
-            f"Platform: {platform.platform()}\nMachine: {platform.machine()}\nProcessor: {platform.processor()}",
+            f"{uname.system} {uname.release} ({uname.version})",
+            f"Platform: {platform.platform()}\nMachine: {uname.machine}\nProcessor: {uname.processor}",
             category=category
         )
         
@@ -194,21 +382,22 @@ class ThoroughDiagnosticTool:
         # Memory info
         try:
             if self.platform == "Linux":
-                with open('/proc/meminfo', 'r') as f:
-                    for line in f:
-                        if line.startswith('MemTotal:'):
-                            mem_kb = int(line.split()[1])
-                            mem_gb = mem_kb / (1024 * 1024)
-                            status = "OK" if mem_gb >= 4 else "WARNING"
-                            rec = "At least 4GB RAM recommended for LLM inference" if status == "WARNING" else None
-                            self.add_result(
-                                "System Memory",
-                                status,
-                                f"{mem_gb:.1f} GB total",
-                                recommendation=rec,
-                                category=category
-                            )
-                            break
+                # MemTotal is the first line of /proc/meminfo: read a short
+                # prefix instead of decoding and iterating the whole file
+                with open('/proc/meminfo', 'rb') as f:
+                    head = f.read(128)
+                if head.startswith(b'MemTotal:'):
+                    mem_kb = int(head.split(b':', 1)[1].split()[0])
+                    mem_gb = mem_kb / (1024 * 1024)
+                    status = "OK" if mem_gb >= 4 else "WARNING"
+                    rec = "At least 4GB RAM recommended for LLM inference" if status == "WARNING" else None
+                    self.add_result(
+                        "System Memory",
+                        status,
+                        f"{mem_gb:.1f} GB total",
+                        recommendation=rec,
+                        category=category
+                    )
             elif self.platform == "Darwin":
                 result = subprocess.run(['sysctl', 'hw.memsize'], 
                                       capture_output=True, text=True, timeout=5)
@@ -235,12 +424,7 @@ class ThoroughDiagnosticTool:
         
         # Disk space
         try:
-            import shutil
-            if self.platform == "Windows":
-                drive = Path.cwd().drive
-                total, used, free = shutil.disk_usage(drive if drive else "/")
-            else:
-                total, used, free = shutil.disk_usage(str(Path.home()))
+            total, used, free = self._disk_usage()
             
             free_gb = free / (1024**3)
             total_gb = total / (1024**3)
@@ -286,10 +470,15 @@ class ThoroughDiagnosticTool:
         
         for name, exe_path in executables:
             full_path = self.repo_root / exe_path
-            if full_path.exists():
-                size = full_path.stat().st_size
-                size_mb = size / (1024 * 1024)
-                is_exec = os.access(full_path, os.X_OK) if self.platform != "Windows" else True
+            try:
+                st = os.stat(full_path)
+            except (FileNotFoundError, NotADirectoryError):
+                st = None
+            
+            if st is not None:
+                size_mb = st.st_size / (1024 * 1024)
+                # Exec bit from the same stat result instead of an access() call
+                is_exec = bool(st.st_mode & 0o111) if self.platform != "Windows" else True
                 
                 status = "OK" if is_exec else "WARNING"
                 rec = "File should be executable" if not is_exec else None
@@ -323,14 +512,19 @@ class ThoroughDiagnosticTool:
         for name, dir_path in required_dirs:
             full_path = self.repo_root / dir_path
             if full_path.exists() and full_path.is_dir():
-                file_count = sum(1 for _ in full_path.rglob('*') if _.is_file())
-                dir_size = sum(f.stat().st_size for f in full_path.rglob('*') if f.is_file())
-                size_mb = dir_size / (1024 * 1024)
+                # The counts are informational only: quick runs skip the walk
+                # unless verbose output asked for the details
+                if self.quick and not self.verbose:
+                    message = "Found"
+                else:
+                    file_count, dir_size = _walk_stats(full_path)
+                    size_mb = dir_size / (1024 * 1024)
+                    message = f"Found ({file_count} files, {size_mb:.1f} MB)"
                 
                 self.add_result(
                     name,
                     "OK",
-                    f"Found ({file_count} files, {size_mb:.1f} MB)",
+                    message,
                     f"Path: {full_path}",
                     category=category
                 )
@@ -376,6 +570,7 @@ class ThoroughDiagnosticTool:
         """Check all dependencies comprehensively"""
         self.section_header("Dependencies & Libraries")
         category = "Dependencies"
+        probes: List[Tuple[str, str]] = []  # (result name, version command)
         
         # Qt libraries
         if self.platform == "Windows":
@@ -387,8 +582,12 @@ class ThoroughDiagnosticTool:
             
             for lib in qt_libs:
                 lib_path = lib_dir / lib
-                if lib_path.exists():
-                    size = lib_path.stat().st_size / (1024 * 1024)
+                try:
+                    size = os.stat(lib_path).st_size / (1024 * 1024)
+                except (FileNotFoundError, NotADirectoryError):
+                    size = None
+                
+                if size is not None:
                     self.add_result(
                         f"Qt Library: {lib}",
                         "OK",
@@ -407,13 +606,27 @@ class ThoroughDiagnosticTool:
                     )
         else:
             # Check Qt via pkg-config
-            try:
-                result = subprocess.run(
-                    ["pkg-config", "--modversion", "Qt6Widgets"],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    version = result.stdout.strip()
+            probes.append(("Qt6 Framework", "pkg-config --modversion Qt6Widgets"))
+        
+        # Check system libraries
+        if self.platform in ("Linux", "Darwin"):
+            probes += [
+                ("libcurl", "curl --version"),
+                ("SQLite3", "sqlite3 --version"),
+            ]
+        if not probes:
+            return
+        
+        # One shell runs every probe: a single fork/exec instead of one per tool
+        try:
+            outcomes = _run_probes([cmd for _, cmd in probes])
+        except (subprocess.TimeoutExpired, OSError) as e:
+            outcomes = [(None, str(e))] * len(probes)
+        
+        for (name, cmd), (code, output) in zip(probes, outcomes):
+            if name == "Qt6 Framework":
+                if code == 0:
+                    version = output.strip()
                     status = "OK" if version >= "6.5" else "WARNING"
                     rec = "Qt 6.5+ recommended" if status == "WARNING" else None
                     self.add_result(
@@ -423,6 +636,14 @@ class ThoroughDiagnosticTool:
                         recommendation=rec,
                         category=category
                     )
+                elif code is None or code == 127:
+                    self.add_result(
+                        "Qt6 Framework",
+                        "WARNING",
+                        "Could not verify",
+                        output if code is None else f"{cmd.split()[0]}: command not found",
+                        category=category
+                    )
                 else:
                     self.add_result(
                         "Qt6 Framework",
@@ -431,55 +652,27 @@ class ThoroughDiagnosticTool:
                         "May still be available via system paths",
                         category=category
                     )
-            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            elif code == 0:
+                version = output.split('\n')[0]
+                self.add_result(
+                    f"Library: {name}",
+                    "OK",
+                    "Available",
+                    f"Version: {version}",
+                    category=category
+                )
+            elif code is None or code == 127:
                 self.add_result(
-                    "Qt6 Framework",
+                    f"Library: {name}",
                     "WARNING",
                     "Could not verify",
-                    str(e),
                     category=category
                 )
-        
-        # Check system libraries
-        system_libs = []
-        if self.platform == "Linux":
-            system_libs = [
-                ("libcurl", "curl --version"),
-                ("SQLite3", "sqlite3 --version"),
-            ]
-        elif self.platform == "Darwin":
-            system_libs = [
-                ("libcurl", "curl --version"),
-                ("SQLite3", "sqlite3 --version"),
-            ]
-        
-        for lib_name, check_cmd in system_libs:
-            try:
-                result = subprocess.run(
-                    check_cmd.split(),
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    version = result.stdout.split('\n')[0]
-                    self.add_result(
-                        f"Library: {lib_name}",
-                        "OK",
-                        "Available",
-                        f"Version: {version}",
-                        category=category
-                    )
-                else:
-                    self.add_result(
-                        f"Library: {lib_name}",
-                        "WARNING",
-                        "Not found",
-                        category=category
-                    )
-            except (subprocess.TimeoutExpired, FileNotFoundError):
+            else:
                 self.add_result(
-                    f"Library: {lib_name}",
+                    f"Library: {name}",
                     "WARNING",
-                    "Could not verify",
+                    "Not found",
                     category=category
                 )
     
@@ -498,16 +691,18 @@ class ThoroughDiagnosticTool:
             "wvulkan": {"name": "Vulkan (Cross-platform GPU)", "required": False},
         }
         
+        # One listing of the ggml directory answers every variant; when the
+        # directory itself is missing no per-variant probes are made
+        present = self._dir_names(os.path.join("app", "lib", "ggml"))
+        
         for variant, info in variants.items():
             variant_path = ggml_base / variant
-            if variant_path.exists():
+            if os.path.normcase(variant) in present:
                 # Count library files
-                if self.platform == "Windows":
-                    libs = list(variant_path.glob("*.dll"))
-                else:
-                    libs = list(variant_path.glob("*.so")) + list(variant_path.glob("*.dylib"))
+                suffixes = (".dll",) if self.platform == "Windows" else (".so", ".dylib")
+                libs = _sizes_by_suffix(os.fspath(variant_path), suffixes)
                 
-                total_size = sum(f.stat().st_size for f in libs) / (1024 * 1024)
+                total_size = sum(size for _, size in libs) / (1024 * 1024)
                 
                 self.add_result(
                     f"Backend: {info['name']}",
@@ -532,19 +727,26 @@ class ThoroughDiagnosticTool:
         
         # Check precompiled libraries
         precompiled_dir = self.repo_root / "app" / "lib" / "precompiled"
-        if precompiled_dir.exists():
-            precompiled_variants = [d.name for d in precompiled_dir.iterdir() if d.is_dir()]
-            total_size = sum(
-                f.stat().st_size 
-                for d in precompiled_dir.iterdir() if d.is_dir()
-                for f in d.rglob('*') if f.is_file()
-            ) / (1024 * 1024)
+        try:
+            # One listing yields the variant names; each variant is then
+            # sized with a scandir walk that reuses the cached dirent types
+            with os.scandir(precompiled_dir) as it:
+                variant_dirs = [(e.name, e.path) for e in it if e.is_dir()]
+        except (FileNotFoundError, NotADirectoryError):
+            variant_dirs = None
+        
+        if variant_dirs is not None:
+            precompiled_variants = [name for name, _ in variant_dirs]
+            details = f"Path: {precompiled_dir}"
+            if self.verbose or not self.quick:
+                total_size = sum(_walk_stats(path)[1] for _, path in variant_dirs) / (1024 * 1024)
+                details += f"\nTotal size: {total_size:.1f} MB"
             
             self.add_result(
                 "Precompiled LLM Libraries",
                 "OK",
                 f"Found {len(precompiled_variants)} variant(s): {', '.join(precompiled_variants)}",
-                f"Path: {precompiled_dir}\nTotal size: {total_size:.1f} MB",
+                details,
                 category=category
             )
         else:
@@ -560,10 +762,10 @@ class ThoroughDiagnosticTool:
         # Check for local models
         models_dir = self.data_dir / "llms"
         if models_dir.exists():
-            models = list(models_dir.glob("*.gguf"))
+            models = _sizes_by_suffix(os.fspath(models_dir), (".gguf",))
             if models:
-                total_size = sum(m.stat().st_size for m in models) / (1024 * 1024)
-                model_names = [m.name for m in models[:5]]  # First 5
+                total_size = sum(size for _, size in models) / (1024 * 1024)
+                model_names = [name for name, _ in models[:5]]  # First 5
                 
                 self.add_result(
                     "Local LLM Models",
@@ -632,38 +834,65 @@ class ThoroughDiagnosticTool:
             )
             return
         
+        # Imported only when there is a database to open; sqlite3 loads a
+        # shared library that runs without a database never need
+        import sqlite3
+        
         # Check database integrity
         try:
-            with sqlite3.connect(db_path) as conn:
+            # Read-only open: the diagnostic never writes, but still takes
+            # SQLite's normal locks and honours hot journals/WAL, so results
+            # stay consistent while the application is using the database
+            conn = sqlite3.connect(
+                f"{db_path.absolute().as_uri()}?mode=ro",
+                uri=True
+            )
+            with conn:
+                conn.execute("PRAGMA query_only=1")
                 cursor = conn.cursor()
                 
-                # Integrity check
-                try:
-                    cursor.execute("PRAGMA integrity_check")
-                    integrity = cursor.fetchone()[0]
-                    if integrity == "ok":
-                        self.add_result(
-                            "Database Integrity",
-                            "OK",
-                            "Passed integrity check",
-                            category=category
-                        )
-                    else:
+                # The integrity check reads every page and the row counts below
+                # walk each table again: serve both from one memory mapping and
+                # a large page cache instead of repeated read() calls
+                cursor.execute("PRAGMA mmap_size=268435456")
+                cursor.execute("PRAGMA cache_size=-65536")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                
+                # Integrity check (reads every page, so quick mode skips it)
+                if self.quick:
+                    self.add_result(
+                        "Database Integrity",
+                        "SKIP",
+                        "Skipped in quick mode",
+                        category=category
+                    )
+                else:
+                    try:
+                        cursor.execute("PRAGMA integrity_check")
+                        integrity = cursor.fetchone()[0]
+                        if integrity == "ok":
+                            self.add_result(
+                                "Database Integrity",
+                                "OK",
+                                "Passed integrity check",
+                                category=category
+                            )
+                        else:
+                            self.add_result(
+                                "Database Integrity",
+                                "FAIL",
+                                "Integrity check failed",
+                                integrity,
+                                recommendation="Database may be corrupted. Consider backup and repair.",
+                                category=category
+                            )
+                    except sqlite3.Error as e:
                         self.add_result(
                             "Database Integrity",
                             "FAIL",
-                            "Integrity check failed",
-                            integrity,
-                            recommendation="Database may be corrupted. Consider backup and repair.",
+                            f"Error checking integrity: {str(e)}",
                             category=category
                         )
-                except sqlite3.Error as e:
-                    self.add_result(
-                        "Database Integrity",
-                        "FAIL",
-                        f"Error checking integrity: {str(e)}",
-                        category=category
-                    )
             
             # Check tables
             try:
@@ -707,23 +936,61 @@ class ThoroughDiagnosticTool:
                     )
                 
                 # Check table statistics
-                stats = {}
-                for table in found_tables:
+                if self.quick:
+                    # No table scans in quick mode: report the row estimates
+                    # ANALYZE left in sqlite_stat1, if the database has any
+                    estimates = {}
+                    if "sqlite_stat1" in tables:
+                        cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+                        for tbl, stat in cursor.fetchall():
+                            if stat:
+                                estimates.setdefault(tbl, stat.split()[0])
+                    stats = {t: estimates[t] for t in found_tables if t in estimates}
+                    
+                    if stats:
+                        stats_str = "\n".join([f"{k}: ~{v} rows" for k, v in stats.items()])
+                        self.add_result(
+                            "Database Statistics",
+                            "INFO",
+                            f"{len(stats)} tables estimated (sqlite_stat1)",
+                            stats_str,
+                            category=category
+                        )
+                    else:
+                        self.add_result(
+                            "Database Statistics",
+                            "SKIP",
+                            "Row counts skipped in quick mode",
+                            category=category
+                        )
+                else:
+                    stats = {}
                     try:
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
-                        stats[table] = count
+                        # Every count in one statement: one prepare, one fetch
+                        # (names come from the expected_tables whitelist)
+                        if found_tables:
+                            cursor.execute(
+                                "SELECT " + ", ".join(f'(SELECT COUNT(*) FROM "{t}")' for t in found_tables)
+                            )
+                            stats = dict(zip(found_tables, cursor.fetchone()))
                     except sqlite3.Error:
-                        stats[table] = "N/A"
-                
-                stats_str = "\n".join([f"{k}: {v} rows" for k, v in stats.items()])
-                self.add_result(
-                    "Database Statistics",
-                    "INFO",
-                    f"{len(stats)} tables analyzed",
-                    stats_str,
-                    category=category
-                )
+                        # Count table by table so one bad table only loses its own row
+                        for table in found_tables:
+                            try:
+                                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                                count = cursor.fetchone()[0]
+                                stats[table] = count
+                            except sqlite3.Error:
+                                stats[table] = "N/A"
+                    
+                    stats_str = "\n".join([f"{k}: {v} rows" for k, v in stats.items()])
+                    self.add_result(
+                        "Database Statistics",
+                        "INFO",
+                        f"{len(stats)} tables analyzed",
+                        stats_str,
+                        category=category
+                    )
                 
             except sqlite3.Error as e:
                 self.add_result(
@@ -762,9 +1029,13 @@ class ThoroughDiagnosticTool:
             )
         else:
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
+                # Raw bytes: the line count and the pattern scans below need
+                # neither a decoded copy nor a list of lines
+                with open(config_path, 'rb') as f:
                     config_content = f.read()
-                    line_count = len(config_content.splitlines())
+                    line_count = config_content.count(b'\n')
+                    if config_content and not config_content.endswith(b'\n'):
+                        line_count += 1  # Last line without a trailing newline
                     
                     self.add_result(
                         "Main Configuration",
@@ -775,8 +1046,9 @@ class ThoroughDiagnosticTool:
                     )
                     
                     # Check for API keys (without revealing them)
-                    has_openai = bool(re.search(r'openai.*key', config_content, re.I))
-                    has_gemini = bool(re.search(r'gemini.*key', config_content, re.I))
+                    providers = {m.group(1).lower() for m in _API_KEY_RE.finditer(config_content)}
+                    has_openai = b'openai' in providers
+                    has_gemini = b'gemini' in providers
                     
                     if has_openai or has_gemini:
                         apis = []
@@ -802,14 +1074,8 @@ class ThoroughDiagnosticTool:
                     
                     # Check for other settings
                     settings_found = []
-                    patterns = {
-                        "Language": r'language\s*=',
-                        "Theme": r'theme\s*=',
-                        "LLM Model": r'llm.*model',
-                    }
-                    
-                    for setting, pattern in patterns.items():
-                        if re.search(pattern, config_content, re.I):
+                    for setting, rx in _CONFIG_PATTERNS:
+                        if rx.search(config_content):
                             settings_found.append(setting)
                     
                     if settings_found:
@@ -888,42 +1154,19 @@ class ThoroughDiagnosticTool:
         self.section_header("Feature Implementation Validation")
         category = "Features"
         
-        # Map features to their implementation files
-        features = [
-            ("Core Categorization", "app/lib/CategorizationService.cpp", True),
-            ("File Scanner", "app/lib/FileScanner.cpp", True),
-            ("Database Manager", "app/lib/DatabaseManager.cpp", True),
-            ("LLM Client Interface", "app/lib/LLMClient.cpp", True),
-            ("Local LLM Client", "app/lib/LocalLLMClient.cpp", True),
-            ("OpenAI Client", "app/lib/LLMClient.cpp", True),
-            ("Gemini Client", "app/lib/GeminiClient.cpp", True),
-            ("Categorization Dialog", "app/lib/CategorizationDialog.cpp", True),
-            ("User Profile Manager", "app/lib/UserProfileManager.cpp", False),
-            ("User Profile Dialog", "app/lib/UserProfileDialog.cpp", False),
-            ("Folder Learning", "app/lib/FolderLearningDialog.cpp", False),
-            ("File Tinder", "app/lib/FileTinderDialog.cpp", False),
-            ("Cache Manager", "app/lib/CacheManagerDialog.cpp", False),
-            ("Undo Manager", "app/lib/UndoManager.cpp", False),
-            ("Dry Run Preview", "app/lib/DryRunPreviewDialog.cpp", False),
-            ("Whitelist Manager", "app/lib/WhitelistManagerDialog.cpp", False),
-            ("Custom LLM Dialog", "app/lib/CustomLLMDialog.cpp", False),
-            ("LLM Selection Dialog", "app/lib/LLMSelectionDialog.cpp", True),
-            ("API Usage Statistics", "app/lib/UsageStatsDialog.cpp", False),
-            ("Translation Manager", "app/lib/TranslationManager.cpp", False),
-            ("Consistency Service", "app/lib/ConsistencyPassService.cpp", False),
-            ("Categorization Progress", "app/lib/CategorizationProgressDialog.cpp", True),
-        ]
-        
-        for feature_name, file_path, is_core in features:
-            full_path = self.repo_root / file_path
-            if full_path.exists():
-                size = full_path.stat().st_size
-                lines = 0
-                try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = len(f.readlines())
-                except:
-                    pass
+        def feature_stats(file_path: str) -> Optional[Tuple[int, int]]:
+            # Missing files are answered from the directory listing, no stat needed
+            rel_dir, file_name = os.path.split(file_path)
+            if os.path.normcase(file_name) not in self._dir_names(rel_dir):
+                return None
+            return _source_file_stats(os.path.join(self.repo_root_str, file_path))
+        
+        # A plain loop: this check already runs on the run_all_checks pool,
+        # and shared sources are read once thanks to _source_file_stats' cache
+        for feature_name, file_path, is_core in FEATURE_SOURCES:
+            stats = feature_stats(file_path)
+            if stats is not None:
+                size, lines = stats
                 
                 self.add_result(
                     f"Feature: {feature_name}",
@@ -1132,6 +1375,7 @@ class ThoroughDiagnosticTool:
         # Database query performance
         db_path = self.data_dir / "aifilesorter.db"
         if db_path.exists() and not self.quick:
+            import sqlite3
             try:
                 conn = sqlite3.connect(db_path)
                 cursor = conn.cursor()
@@ -1166,12 +1410,7 @@ class ThoroughDiagnosticTool:
         
         # Check available disk space
         try:
-            import shutil
-            if self.platform == "Windows":
-                drive = Path.cwd().drive
-                total, used, free = shutil.disk_usage(drive if drive else "/")
-            else:
-                total, used, free = shutil.disk_usage(str(Path.home()))
+            total, used, free = self._disk_usage()
             
             free_gb = free / (1024**3)
             
@@ -1277,22 +1516,27 @@ class ThoroughDiagnosticTool:
     
     # ==================== Report Generation ====================
     
-    def generate_json_report(self, output_file: str) -> dict:
-        """Generate comprehensive JSON report"""
-        duration = (datetime.datetime.now() - self.start_time).total_seconds()
+    def _result_timestamp(self, result: DiagnosticResult) -> str:
+        """ISO timestamp of a result, from the run start plus its monotonic offset"""
+        offset = datetime.timedelta(microseconds=(result.t_ns - self._t0_ns) // 1000)
+        return (self.start_time + offset).isoformat()
+    
+    def generate_json_report(self, output_file: str, compact: bool = False) -> dict:
+        """Generate comprehensive JSON report (unindented when compact)"""
+        duration = (time.monotonic_ns() - self._t0_ns) / 1e9
         
         # Calculate statistics
         total = len(self.results)
-        stats_by_status = defaultdict(int)
-        stats_by_category = defaultdict(lambda: defaultdict(int))
-        
-        for result in self.results:
-            stats_by_status[result.status] += 1
-            stats_by_category[result.category][result.status] += 1
+        pair_counts = Counter((r.category, r.status) for r in self.results)
+        stats_by_status = Counter()
+        stats_by_category: Dict[str, Dict[str, int]] = {}
+        for (category, status), count in pair_counts.items():
+            stats_by_status[status] += count
+            stats_by_category.setdefault(category, {})[status] = count
         
-        # Overall health
-        fail_count = stats_by_status["FAIL"]
-        warning_count = stats_by_status["WARNING"]
+        # Overall health (FAIL/WARNING are always reported, even at zero)
+        fail_count = stats_by_status.setdefault("FAIL", 0)
+        warning_count = stats_by_status.setdefault("WARNING", 0)
         
         if fail_count > 0:
             health = "CRITICAL"
@@ -1312,15 +1556,15 @@ class ThoroughDiagnosticTool:
                 "quick_mode": self.quick,
             },
             "system_info": {
-                "platform": platform.system(),
-                "release": platform.release(),
-                "machine": platform.machine(),
+                "platform": self._uname.system,
+                "release": self._uname.release,
+                "machine": self._uname.machine,
                 "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
             },
             "summary": {
                 "total_checks": total,
                 "by_status": dict(stats_by_status),
-                "by_category": {k: dict(v) for k, v in stats_by_category.items()},
+                "by_category": stats_by_category,
                 "overall_health": health,
             },
             "results_by_category": {},
@@ -1336,7 +1580,7 @@ class ThoroughDiagnosticTool:
                     "message": r.message,
                     "details": r.details,
                     "recommendation": r.recommendation,
-                    "timestamp": r.timestamp
+                    "timestamp": self._result_timestamp(r)
                 }
                 for r in results
             ]
@@ -1350,15 +1594,27 @@ class ThoroughDiagnosticTool:
                 "message": r.message,
                 "details": r.details,
                 "recommendation": r.recommendation,
-                "timestamp": r.timestamp
+                "timestamp": self._result_timestamp(r)
             }
             for r in self.results
         ]
         
         # Save to file
         try:
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2)
+            if orjson is not None:
+                option = orjson.OPT_NON_STR_KEYS
+                if not compact:
+                    option |= orjson.OPT_INDENT_2
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(report, option=option))
+            else:
+                # json.dump emits many small chunks; a 1 MiB buffer turns
+                # them into a handful of write() calls
+                with open(output_file, 'w', buffering=1 << 20) as f:
+                    if compact:
+                        json.dump(report, f, separators=(",", ":"))
+                    else:
+                        json.dump(report, f, indent=2)
             self.log(f"\n{Colors.OKGREEN}✓ JSON report saved: {output_file}{Colors.ENDC}")
         except Exception as e:
             self.log(f"\n{Colors.FAIL}✗ Failed to save JSON report: {e}{Colors.ENDC}")
@@ -1610,46 +1866,51 @@ class ThoroughDiagnosticTool:
     
     def print_summary(self, json_report: dict):
         """Print summary to console"""
-        self.section_header("Summary")
-        
-        stats = json_report['summary']['by_status']
-        
-        self.log(f"Total Checks: {json_report['summary']['total_checks']}")
-        self.log(f"  ✓ Passed:   {stats.get('OK', 0)}", Colors.OKGREEN)
-        self.log(f"  ⚠ Warnings: {stats.get('WARNING', 0)}", Colors.WARNING)
-        self.log(f"  ✗ Failed:   {stats.get('FAIL', 0)}", Colors.FAIL)
-        self.log(f"  ℹ Info:     {stats.get('INFO', 0)}", Colors.OKBLUE)
-        self.log(f"  ⊘ Skipped:  {stats.get('SKIP', 0)}", Colors.OKCYAN)
-        
-        duration = json_report['diagnostic_metadata']['duration_seconds']
-        self.log(f"\nDuration: {duration:.2f} seconds")
-        
-        health = json_report['summary']['overall_health']
-        health_color = {
-            "EXCELLENT": Colors.OKGREEN,
-            "GOOD": Colors.WARNING,
-            "NEEDS ATTENTION": Colors.WARNING,
-            "CRITICAL": Colors.FAIL
-        }.get(health, "")
-        
-        self.log(f"\nOverall Health: {health}", health_color + Colors.BOLD)
+        # Summary lines are collected and written to stdout in one go
+        with self._buffered_output():
+            self.section_header("Summary")
+            
+            stats = json_report['summary']['by_status']
+            
+            self.log(f"Total Checks: {json_report['summary']['total_checks']}")
+            self.log(f"  ✓ Passed:   {stats.get('OK', 0)}", Colors.OKGREEN)
+            self.log(f"  ⚠ Warnings: {stats.get('WARNING', 0)}", Colors.WARNING)
+            self.log(f"  ✗ Failed:   {stats.get('FAIL', 0)}", Colors.FAIL)
+            self.log(f"  ℹ Info:     {stats.get('INFO', 0)}", Colors.OKBLUE)
+            self.log(f"  ⊘ Skipped:  {stats.get('SKIP', 0)}", Colors.OKCYAN)
+            
+            duration = json_report['diagnostic_metadata']['duration_seconds']
+            self.log(f"\nDuration: {duration:.2f} seconds")
+            
+            health = json_report['summary']['overall_health']
+            health_color = {
+                "EXCELLENT": Colors.OKGREEN,
+                "GOOD": Colors.WARNING,
+                "NEEDS ATTENTION": Colors.WARNING,
+                "CRITICAL": Colors.FAIL
+            }.get(health, "")
+            
+            self.log(f"\nOverall Health: {health}", health_color + Colors.BOLD)
     
     # ==================== Main Execution ====================
     
     def run_all_checks(self, test_apis: bool = False):
         """Run all diagnostic checks"""
-        self.log(f"{Colors.HEADER}{Colors.BOLD}")
-        self.log("╔════════════════════════════════════════════════════════════════════════════╗")
-        self.log("║          AI FILE SORTER - THOROUGH DIAGNOSTIC TOOL v2.0                    ║")
-        self.log("║              Comprehensive Feature & System Validation                     ║")
-        self.log("╚════════════════════════════════════════════════════════════════════════════╝")
-        self.log(Colors.ENDC)
-        
-        if self.quick:
-            self.log(f"{Colors.WARNING}⚡ Quick mode enabled - skipping slow tests{Colors.ENDC}\n")
-        
-        # List of all check methods
-        check_methods = [
+        with self._buffered_output():
+            self.log(f"{Colors.HEADER}{Colors.BOLD}")
+            self.log("╔════════════════════════════════════════════════════════════════════════════╗")
+            self.log("║          AI FILE SORTER - THOROUGH DIAGNOSTIC TOOL v2.0                    ║")
+            self.log("║              Comprehensive Feature & System Validation                     ║")
+            self.log("╚════════════════════════════════════════════════════════════════════════════╝")
+            self.log(Colors.ENDC)
+            
+            if self.quick:
+                self.log(f"{Colors.WARNING}⚡ Quick mode enabled - skipping slow tests{Colors.ENDC}\n")
+        
+        # Independent, I/O-bound checks (stat walks, subprocesses, sqlite)
+        # run on a thread pool; their buffered output is replayed in order.
+        # Verbose runs execute them one after another, unbuffered, instead.
+        parallel_checks = [
             self.check_system_info,
             self.check_file_structure,
             self.check_dependencies,
@@ -1658,23 +1919,69 @@ class ThoroughDiagnosticTool:
             self.check_configuration,
             self.check_features,
             self.check_logs,
+        ]
+        
+        # Benchmarks must not compete with other checks for disk and CPU,
+        # and may rely on directories created above, so they run last
+        serial_checks = [
             self.check_performance,
             lambda: self.check_api_connectivity(test_apis),
         ]
         
-        # Run all checks with error handling
-        for check_method in check_methods:
-            try:
-                check_method()
-            except KeyboardInterrupt:
-                self.log(f"\n{Colors.WARNING}⚠ Diagnostic interrupted by user{Colors.ENDC}")
-                sys.exit(1)
-            except Exception as e:
-                import traceback
-                self.log(f"\n{Colors.FAIL}✗ Error in check: {e}{Colors.ENDC}")
-                if self.verbose:
-                    self.log(traceback.format_exc(), Colors.FAIL)
-
+        if self.verbose:
+            # Live progress matters more than overlap when debugging
+            serial_checks = parallel_checks + serial_checks
+        else:
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                futures = [executor.submit(self._run_check, m) for m in parallel_checks]
+                for future in futures:
+                    try:
+                        lines, results, e = future.result()
+                    except KeyboardInterrupt:
+                        for pending in futures:
+                            pending.cancel()
+                        self.log(f"\n{Colors.WARNING}⚠ Diagnostic interrupted by user{Colors.ENDC}")
+                        sys.exit(1)
+                    
+                    if lines:
+                        sys.stdout.write("\n".join(lines) + "\n")
+                    for result in results:
+                        self._record(result)
+                    if e is not None:
+                        self._log_check_error(e)
+        
+        # Run remaining checks with error handling; each section is written
+        # in one go, except in verbose mode where output appears as it happens
+        for check_method in serial_checks:
+            with (nullcontext() if self.verbose else self._buffered_output()):
+                try:
+                    check_method()
+                except KeyboardInterrupt:
+                    self.log(f"\n{Colors.WARNING}⚠ Diagnostic interrupted by user{Colors.ENDC}")
+                    sys.exit(1)
+                except Exception as e:
+                    self._log_check_error(e)
+    
+    def _run_check(self, check_method):
+        """Run one check in a worker thread, buffering its output and results"""
+        self._local.lines = []
+        self._local.results = []
+        error = None
+        try:
+            check_method()
+        except Exception as e:
+            error = e
+        finally:
+            lines, results = self._local.lines, self._local.results
+            del self._local.lines, self._local.results
+        return lines, results, error
+    
+    def _log_check_error(self, e: Exception):
+        """Report an exception raised by a check"""
+        self.log(f"\n{Colors.FAIL}✗ Error in check: {e}{Colors.ENDC}")
+        if self.verbose:
+            import traceback
+            self.log("".join(traceback.format_exception(type(e), e, e.__traceback__)), Colors.FAIL)
 
 def main():
     """Main entry point"""
@@ -1689,6 +1996,7 @@ Examples:
   %(prog)s --html --markdown        # Generate all report formats
   %(prog)s --test-apis              # Test API connectivity (requires internet)
   %(prog)s --quick                  # Fast scan, skip slow tests
+  %(prog)s --compact -o r.json      # Smaller JSON for machine consumers
   %(prog)s -v --html --markdown     # Full verbose with all reports
         """
     )
@@ -1729,6 +2037,12 @@ Examples:
         help="Quick mode - skip slow tests for rapid validation"
     )
     
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON report without indentation (smaller, faster to write)"
+    )
+    
     args = parser.parse_args()
     
     # Create and run diagnostic tool
@@ -1739,7 +2053,7 @@ Examples:
     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
     
     json_file = args.output or f"thorough_diagnostic_{timestamp}.json"
-    json_report = tool.generate_json_report(json_file)
+    json_report = tool.generate_json_report(json_file, compact=args.compact)
     
     if args.html:
         # Properly replace extension using pathlib